@@ -79,7 +79,10 @@ def init_clients(app):
             neo4j_client = Neo4jClient(
                 app.config['NEO4J_URI'],
                 app.config['NEO4J_USER'],
-                app.config['NEO4J_PASSWORD']
+                app.config['NEO4J_PASSWORD'],
+                max_connection_pool_size=app.config.get('NEO4J_MAX_CONNECTION_POOL_SIZE', 100),
+                connection_acquisition_timeout=app.config.get('NEO4J_CONNECTION_ACQUISITION_TIMEOUT', 60.0),
+                max_transaction_retry_time=app.config.get('NEO4J_MAX_TRANSACTION_RETRY_TIME', 30.0)
             )
             logger.info("Neo4j client initialized successfully")
         else:
@@ -92,7 +95,10 @@ def init_clients(app):
     try:
         if 'REDIS_URL' in app.config:
             from app.utils.redis_client import RedisClient
-            redis_client = RedisClient(app.config['REDIS_URL'])
+            redis_client = RedisClient.from_shared_pool(
+                app.config['REDIS_URL'],
+                max_connections=app.config.get('REDIS_MAX_CONNECTIONS', 128)
+            )
             logger.info("Redis client initialized successfully")
         else:
             logger.warning("Redis configuration not found, skipping initialization")
@@ -1,10 +1,16 @@
 import os
 from datetime import timedelta
+import orjson
 from dotenv import load_dotenv
 
 load_dotenv()
 
 
+def json_serializer(value):
+    """JSON/JSONB列序列化（orjson，比标准库json快且直接支持datetime）"""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
 class Config:
     # 基础配置
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key-change-this'
@@ -20,16 +26,28 @@ class Config:
         'pool_pre_ping': True,
         'pool_recycle': 300,
         'pool_timeout': 20,
-        'max_overflow': 20
+        'max_overflow': 20,
+        'json_serializer': json_serializer,
+        'json_deserializer': orjson.loads,
+        # 已编译SQL语句缓存容量（默认500）
+        'query_cache_size': 1200
     }
+    # psycopg2批量执行：INSERT使用多VALUES，其余语句使用execute_batch
+    # （该参数只有psycopg2方言支持，其他驱动传入会导致 create_engine 报错）
+    if DATABASE_URL.split('://', 1)[0] in ('postgresql', 'postgresql+psycopg2'):
+        SQLALCHEMY_ENGINE_OPTIONS['executemany_mode'] = 'values_plus_batch'
 
     # Neo4j配置
     NEO4J_URI = os.environ.get('NEO4J_URI') or 'bolt://localhost:7687'
     NEO4J_USER = os.environ.get('NEO4J_USER') or 'neo4j'
     NEO4J_PASSWORD = os.environ.get('NEO4J_PASSWORD') or 'utopia_neo4j_password'
+    NEO4J_MAX_CONNECTION_POOL_SIZE = int(os.environ.get('NEO4J_MAX_CONNECTION_POOL_SIZE', 100))
+    NEO4J_CONNECTION_ACQUISITION_TIMEOUT = float(os.environ.get('NEO4J_CONNECTION_ACQUISITION_TIMEOUT', 60.0))
+    NEO4J_MAX_TRANSACTION_RETRY_TIME = float(os.environ.get('NEO4J_MAX_TRANSACTION_RETRY_TIME', 30.0))
 
     # Redis配置
     REDIS_URL = os.environ.get('REDIS_URL') or 'redis://:utopia_redis_password@localhost:6379/0'
+    REDIS_MAX_CONNECTIONS = int(os.environ.get('REDIS_MAX_CONNECTIONS', 128))
 
     # JWT配置
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY') or 'jwt-secret-string-change-this'
@@ -63,6 +81,8 @@ class ProductionConfig(Config):
 class TestingConfig(Config):
     TESTING = False
     WTF_CSRF_ENABLED = False
+    # 测试环境降低密码哈希迭代次数，仍走相同的哈希/校验流程
+    PASSWORD_HASH_METHOD = 'pbkdf2:sha256:1000'
 
 
 config = {
@@ -1,5 +1,6 @@
 # app/models/user.py - 修复版本
 from datetime import datetime
+from flask import current_app, has_app_context
 from sqlalchemy.dialects.postgresql import UUID
 from werkzeug.security import generate_password_hash, check_password_hash
 import uuid
@@ -28,8 +29,12 @@ class User(db.Model):
     permissions = db.relationship('UserPermission', backref='user', uselist=False, cascade='all, delete-orphan')
 
     def set_password(self, password):
-        """设置密码"""
-        self.password_hash = generate_password_hash(password)
+        """设置密码（哈希方法可由 PASSWORD_HASH_METHOD 配置，未配置时使用werkzeug默认值）"""
+        method = current_app.config.get('PASSWORD_HASH_METHOD') if has_app_context() else None
+        if method:
+            self.password_hash = generate_password_hash(password, method=method)
+        else:
+            self.password_hash = generate_password_hash(password)
 
     def check_password(self, password):
         """检查密码"""
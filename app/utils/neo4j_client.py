@@ -11,11 +11,25 @@ logger = logging.getLogger(__name__)
 class Neo4jClient:
     """Neo4j数据库客户端"""
 
-    def __init__(self, uri: str, user: str, password: str):
-        """初始化Neo4j连接"""
+    def __init__(self, uri: str, user: str, password: str,
+                 max_connection_pool_size: int = 100,
+                 connection_acquisition_timeout: float = 60.0,
+                 max_transaction_retry_time: float = 30.0):
+        """初始化Neo4j连接
+
+        max_connection_pool_size / connection_acquisition_timeout 为驱动连接池的
+        最大连接数和获取连接的超时时间（秒）；max_transaction_retry_time 为
+        execute_read/execute_write 遇到可重试错误时的最长重试时间（秒）
+        """
         self.driver = None
         try:
-            self.driver = GraphDatabase.driver(uri, auth=(user, password))
+            self.driver = GraphDatabase.driver(
+                uri,
+                auth=(user, password),
+                max_connection_pool_size=max_connection_pool_size,
+                connection_acquisition_timeout=connection_acquisition_timeout,
+                max_transaction_retry_time=max_transaction_retry_time
+            )
             # 测试连接
             with self.driver.session() as session:
                 session.run("RETURN 1 as test")
@@ -1,47 +1,135 @@
 import redis
 import json
 import logging
-from typing import Any, Optional, Union
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Union
 from datetime import timedelta
 
 logger = logging.getLogger(__name__)
 
+# JSON文本可能的首字符：对象、数组、字符串、true/false/null、数字
+_JSON_FIRST_CHARS = frozenset('{["tfn-0123456789')
+
+# 速率限制脚本：计数+1并刷新过期时间，返回 {当前次数, 剩余TTL}
+_RATE_LIMIT_LUA = """
+local current = redis.call('INCR', KEYS[1])
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+return {current, redis.call('TTL', KEYS[1])}
+"""
+
+# 释放锁脚本：只有锁的值仍是自己的令牌时才删除，避免误删锁过期后他人获得的锁
+_RELEASE_LOCK_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
 class RedisClient:
     """Redis客户端封装类"""
 
-    def __init__(self, redis_url: str):
+    # 最近一次成功命令后的免PING窗口（秒）
+    HEALTH_CACHE_TTL = 1.0
+
+    # 连接参数（独立连接和共享连接池共用）
+    CONNECTION_OPTIONS = {
+        'decode_responses': True,
+        'socket_connect_timeout': 5,
+        'socket_timeout': 5,
+        'retry_on_timeout': True,
+        'health_check_interval': 30
+    }
+
+    # 进程内共享的连接池，按URL区分
+    _shared_pools: Dict[str, redis.ConnectionPool] = {}
+
+    def __init__(self, redis_url: str, connection_pool: Optional[redis.ConnectionPool] = None):
         """
         初始化Redis客户端
 
         Args:
             redis_url: Redis连接URL，格式如 redis://:password@host:port/db
+            connection_pool: 可选的连接池，传入时复用该连接池而不新建连接
         """
+        self._last_ok = 0.0
+        self._rate_script = None
+        self._release_lock_script = None
         try:
-            self.client = redis.from_url(
-                redis_url,
-                decode_responses=True,
-                socket_connect_timeout=5,
-                socket_timeout=5,
-                retry_on_timeout=True,
-                health_check_interval=30
-            )
+            if connection_pool is not None:
+                self.client = redis.Redis(connection_pool=connection_pool)
+            else:
+                self.client = redis.from_url(redis_url, **self.CONNECTION_OPTIONS)
+            # 注册Lua脚本（首次调用后以EVALSHA执行）
+            self._rate_script = self.client.register_script(_RATE_LIMIT_LUA)
+            self._release_lock_script = self.client.register_script(_RELEASE_LOCK_LUA)
             # 测试连接
             self.client.ping()
+            self._mark_ok()
             logger.info("Redis连接成功")
         except Exception as e:
-            logger.error(f"Redis连接失败: {e}")
+            logger.error("Redis连接失败: %s", e)
             self.client = None
 
+    @classmethod
+    def from_shared_pool(cls, redis_url: str, max_connections: int = 128) -> 'RedisClient':
+        """
+        基于进程内共享连接池创建客户端
+
+        同一URL的多个客户端（多次调用应用工厂、多个蓝图）复用同一组socket，
+        避免重复的TCP握手和SELECT。
+
+        Args:
+            redis_url: Redis连接URL
+            max_connections: 连接池最大连接数
+
+        Returns:
+            RedisClient: 使用共享连接池的客户端
+        """
+        pool = cls._shared_pools.get(redis_url)
+        if pool is None:
+            pool = redis.ConnectionPool.from_url(
+                redis_url,
+                max_connections=max_connections,
+                **cls.CONNECTION_OPTIONS
+            )
+            cls._shared_pools[redis_url] = pool
+        return cls(redis_url, connection_pool=pool)
+
     def is_connected(self) -> bool:
         """检查Redis是否连接"""
         if not self.client:
             return False
+        # 最近有成功的命令时直接认为连接正常，避免每次调用都PING
+        if time.monotonic() - self._last_ok < self.HEALTH_CACHE_TTL:
+            return True
         try:
             self.client.ping()
+            self._mark_ok()
             return True
         except:
             return False
 
+    def _mark_ok(self):
+        """记录最近一次成功命令的时间"""
+        self._last_ok = time.monotonic()
+
+    @staticmethod
+    def _serialize(value: Any) -> str:
+        """序列化值（字符串原样存储，其余转为JSON）"""
+        return json.dumps(value, ensure_ascii=False) if not isinstance(value, str) else value
+
+    @staticmethod
+    def _deserialize(value: Any) -> Any:
+        """反序列化值（非JSON格式时返回原始字符串）"""
+        # 先按首字符判断是否可能为JSON，避免普通字符串每次都走异常路径
+        if not value or not isinstance(value, str) or value[0] not in _JSON_FIRST_CHARS:
+            return value
+        try:
+            return json.loads(value)
+        except (json.JSONDecodeError, TypeError):
+            return value
+
     def set(self, key: str, value: Any, expire: Optional[Union[int, timedelta]] = None) -> bool:
         """
         设置键值对
@@ -59,16 +147,14 @@ class RedisClient:
 
         try:
             # 序列化值
-            serialized_value = json.dumps(value, ensure_ascii=False) if not isinstance(value, str) else value
+            serialized_value = self._serialize(value)
 
-            if expire:
-                if isinstance(expire, timedelta):
-                    expire = int(expire.total_seconds())
-                return self.client.setex(key, expire, serialized_value)
-            else:
-                return self.client.set(key, serialized_value)
+            # redis-py 原生支持秒数和timedelta，未设置过期时间时传None
+            result = self.client.set(key, serialized_value, ex=expire or None)
+            self._mark_ok()
+            return bool(result)
         except Exception as e:
-            logger.error(f"Redis SET失败 {key}: {e}")
+            logger.error("Redis SET失败 %s: %s", key, e)
             return False
 
     def get(self, key: str, default: Any = None) -> Any:
@@ -87,19 +173,70 @@ class RedisClient:
 
         try:
             value = self.client.get(key)
+            self._mark_ok()
             if value is None:
                 return default
 
-            # 尝试反序列化JSON
-            try:
-                return json.loads(value)
-            except (json.JSONDecodeError, TypeError):
-                # 如果不是JSON格式，直接返回字符串
-                return value
+            # 尝试反序列化JSON，如果不是JSON格式，直接返回字符串
+            return self._deserialize(value)
         except Exception as e:
-            logger.error(f"Redis GET失败 {key}: {e}")
+            logger.error("Redis GET失败 %s: %s", key, e)
             return default
 
+    def mset_many(self, mapping: Dict[str, Any], expire: Optional[Union[int, timedelta]] = None) -> bool:
+        """
+        批量设置键值对（单次管道往返）
+
+        Args:
+            mapping: 键名到值的映射（值自动序列化为JSON）
+            expire: 过期时间（秒数或timedelta对象）
+
+        Returns:
+            bool: 是否全部设置成功
+        """
+        if not mapping or not self.is_connected():
+            return False
+
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            for key, value in mapping.items():
+                pipe.set(key, self._serialize(value), ex=expire or None)
+            results = pipe.execute()
+            self._mark_ok()
+            return all(results)
+        except Exception as e:
+            logger.error("Redis批量SET失败 (%s 个键): %s", len(mapping), e)
+            return False
+
+    def mget_many(self, keys: List[str], default: Any = None) -> Dict[str, Any]:
+        """
+        批量获取值（单次管道往返）
+
+        Args:
+            keys: 键名列表
+            default: 键不存在时的默认值
+
+        Returns:
+            dict: 键名到反序列化后值的映射
+        """
+        if not keys or not self.is_connected():
+            return {key: default for key in keys}
+
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            for key in keys:
+                pipe.get(key)
+            values = pipe.execute()
+            self._mark_ok()
+
+            return {
+                key: default if value is None else self._deserialize(value)
+                for key, value in zip(keys, values)
+            }
+        except Exception as e:
+            logger.error("Redis批量GET失败 (%s 个键): %s", len(keys), e)
+            return {key: default for key in keys}
+
     def delete(self, *keys: str) -> int:
         """
         删除键
@@ -114,9 +251,11 @@ class RedisClient:
             return 0
 
         try:
-            return self.client.delete(*keys)
+            result = self.client.delete(*keys)
+            self._mark_ok()
+            return result
         except Exception as e:
-            logger.error(f"Redis DELETE失败 {keys}: {e}")
+            logger.error("Redis DELETE失败 %s: %s", keys, e)
             return 0
 
     def exists(self, key: str) -> bool:
@@ -125,9 +264,11 @@ class RedisClient:
             return False
 
         try:
-            return bool(self.client.exists(key))
+            result = self.client.exists(key)
+            self._mark_ok()
+            return bool(result)
         except Exception as e:
-            logger.error(f"Redis EXISTS失败 {key}: {e}")
+            logger.error("Redis EXISTS失败 %s: %s", key, e)
             return False
 
     def expire(self, key: str, time: Union[int, timedelta]) -> bool:
@@ -136,11 +277,11 @@ class RedisClient:
             return False
 
         try:
-            if isinstance(time, timedelta):
-                time = int(time.total_seconds())
-            return self.client.expire(key, time)
+            result = self.client.expire(key, time)
+            self._mark_ok()
+            return result
         except Exception as e:
-            logger.error(f"Redis EXPIRE失败 {key}: {e}")
+            logger.error("Redis EXPIRE失败 %s: %s", key, e)
             return False
 
     def incr(self, key: str, amount: int = 1) -> Optional[int]:
@@ -149,9 +290,11 @@ class RedisClient:
             return None
 
         try:
-            return self.client.incr(key, amount)
+            result = self.client.incr(key, amount)
+            self._mark_ok()
+            return result
         except Exception as e:
-            logger.error(f"Redis INCR失败 {key}: {e}")
+            logger.error("Redis INCR失败 %s: %s", key, e)
             return None
 
     def decr(self, key: str, amount: int = 1) -> Optional[int]:
@@ -160,9 +303,11 @@ class RedisClient:
             return None
 
         try:
-            return self.client.decr(key, amount)
+            result = self.client.decr(key, amount)
+            self._mark_ok()
+            return result
         except Exception as e:
-            logger.error(f"Redis DECR失败 {key}: {e}")
+            logger.error("Redis DECR失败 %s: %s", key, e)
             return None
 
     # 缓存相关方法
@@ -178,22 +323,165 @@ class RedisClient:
         """删除缓存"""
         return self.delete(f"cache:{key}")
 
+    def cache_get_or_set(self, key: str, producer: Callable[[], Any], expire: int = 3600) -> Any:
+        """
+        获取缓存，未命中时调用producer计算并回填
+
+        回填使用 SET ... EX ... NX，并发请求同时未命中时只有第一个写入生效
+
+        Args:
+            key: 缓存键名（不含 "cache:" 前缀）
+            producer: 未命中时计算值的函数
+            expire: 过期时间（秒）
+
+        Returns:
+            缓存值或producer计算的值
+        """
+        value = self.cache_get(key)
+        if value is not None:
+            return value
+
+        value = producer()
+        if value is not None and self.is_connected():
+            try:
+                self.client.set(f"cache:{key}", self._serialize(value), ex=expire, nx=True)
+                self._mark_ok()
+            except Exception as e:
+                logger.error("Redis缓存回填失败 %s: %s", key, e)
+        return value
+
+    def cache_get_or_set_locked(self, key: str, producer: Callable[[], Any], expire: int = 3600,
+                                lock_timeout: int = 5, wait_timeout: Optional[float] = None) -> Any:
+        """
+        获取缓存，未命中时加短锁后计算回填（适用于计算代价高的producer）
+
+        只有拿到 lock:cache:<key> 的请求会调用producer，锁的值为随机令牌，释放时
+        比对令牌，不会删掉锁过期后他人获得的锁。其余请求轮询缓存；锁被释放或过期
+        而缓存仍未回填时重新竞争锁，同一时刻仍只有一个请求在计算。等待超过
+        wait_timeout 仍未取得结果时才自行计算
+
+        Args:
+            key: 缓存键名（不含 "cache:" 前缀）
+            producer: 未命中时计算值的函数
+            expire: 过期时间（秒）
+            lock_timeout: 锁过期时间（秒）
+            wait_timeout: 最长等待时间（秒），默认为 lock_timeout 的3倍
+
+        Returns:
+            缓存值或producer计算的值
+        """
+        value = self.cache_get(key)
+        if value is not None or not self.is_connected():
+            return value if value is not None else producer()
+
+        lock_key = f"lock:cache:{key}"
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + (wait_timeout if wait_timeout is not None else lock_timeout * 3)
+        while True:
+            try:
+                acquired = self.client.set(lock_key, token, ex=lock_timeout, nx=True)
+                self._mark_ok()
+            except Exception as e:
+                logger.error("Redis获取缓存锁失败 %s: %s", key, e)
+                return producer()
+
+            if acquired:
+                try:
+                    return self.cache_get_or_set(key, producer, expire)
+                finally:
+                    self._release_lock(lock_key, token)
+
+            # 其他请求正在计算，等待其回填；锁消失后回到外层重新竞争锁
+            while True:
+                if time.monotonic() >= deadline:
+                    logger.warning("等待缓存回填超时，直接计算 %s", key)
+                    return producer()
+                time.sleep(0.05)
+                value = self.cache_get(key)
+                if value is not None:
+                    return value
+                if not self.exists(lock_key):
+                    break
+
+    def _release_lock(self, lock_key: str, token: str) -> bool:
+        """释放锁（仅当锁仍持有该令牌时）"""
+        try:
+            released = self._release_lock_script(keys=[lock_key], args=[token])
+            self._mark_ok()
+            return bool(released)
+        except Exception as e:
+            logger.error("Redis释放锁失败 %s: %s", lock_key, e)
+            return False
+
+    def cache_delete_pattern(self, pattern: str, batch_size: int = 500) -> int:
+        """
+        按模式批量删除缓存（如 "tag:*"）
+
+        使用SCAN增量遍历代替KEYS，并以UNLINK分批异步释放，避免阻塞Redis主线程
+
+        Args:
+            pattern: 缓存键模式（不含 "cache:" 前缀）
+            batch_size: 每批UNLINK的键数量
+
+        Returns:
+            int: 删除的键数量
+        """
+        if not self.is_connected():
+            return 0
+
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            batch = []
+            for key in self.client.scan_iter(match=f"cache:{pattern}", count=batch_size):
+                batch.append(key)
+                if len(batch) >= batch_size:
+                    pipe.unlink(*batch)
+                    batch = []
+            if batch:
+                pipe.unlink(*batch)
+
+            results = pipe.execute()
+            self._mark_ok()
+            return sum(results)
+        except Exception as e:
+            logger.error("Redis按模式删除缓存失败 %s: %s", pattern, e)
+            return 0
+
     # 标签相关缓存方法
+    # 标签缓存键使用 {tag} 哈希标签，在Redis Cluster中落在同一slot，可以使用多键命令
+    TAG_CACHE_PREFIX = "{tag}"
+
     def cache_tag(self, tag_id: str, tag_data: dict, expire: int = 1800) -> bool:
         """缓存标签数据（30分钟）"""
-        return self.cache_set(f"tag:{tag_id}", tag_data, expire)
+        return self.cache_set(f"{self.TAG_CACHE_PREFIX}:id:{tag_id}", tag_data, expire)
 
     def get_cached_tag(self, tag_id: str) -> Optional[dict]:
         """获取缓存的标签数据"""
-        return self.cache_get(f"tag:{tag_id}")
+        return self.cache_get(f"{self.TAG_CACHE_PREFIX}:id:{tag_id}")
 
     def cache_tag_search(self, query: str, results: list, expire: int = 600) -> bool:
         """缓存标签搜索结果（10分钟）"""
-        return self.cache_set(f"tag_search:{query}", results, expire)
+        return self.cache_set(f"{self.TAG_CACHE_PREFIX}:search:{query}", results, expire)
 
     def get_cached_tag_search(self, query: str) -> Optional[list]:
         """获取缓存的标签搜索结果"""
-        return self.cache_get(f"tag_search:{query}")
+        return self.cache_get(f"{self.TAG_CACHE_PREFIX}:search:{query}")
+
+    def cache_tag_searches(self, results_by_query: Dict[str, list], expire: int = 600) -> bool:
+        """批量缓存多个标签搜索结果（预热用，单次往返）"""
+        return self.mset_many(
+            {
+                f"cache:{self.TAG_CACHE_PREFIX}:search:{query}": results
+                for query, results in results_by_query.items()
+            },
+            expire
+        )
+
+    def get_cached_tag_searches(self, queries: List[str]) -> Dict[str, Optional[list]]:
+        """批量获取缓存的标签搜索结果（单次往返）"""
+        prefix = f"cache:{self.TAG_CACHE_PREFIX}:search:"
+        cached = self.mget_many([f"{prefix}{query}" for query in queries])
+        return {query: cached.get(f"{prefix}{query}") for query in queries}
 
     # 用户会话相关方法
     def set_user_session(self, user_id: str, session_data: dict, expire: int = 86400) -> bool:
@@ -230,30 +518,49 @@ class RedisClient:
             return {'allowed': True, 'current': 0, 'remaining': limit, 'reset_time': 0}
 
         try:
-            pipe = self.client.pipeline()
-            rate_key = f"rate_limit:{key}"
+            current, ttl = self._rate_script(keys=[f"rate_limit:{key}"], args=[window])
+            self._mark_ok()
+            return self._rate_limit_result(current, ttl, limit)
+        except Exception as e:
+            logger.error("Redis速率限制检查失败 %s: %s", key, e)
+            return {'allowed': True, 'current': 0, 'remaining': limit, 'reset_time': 0}
 
-            pipe.incr(rate_key)
-            pipe.expire(rate_key, window)
-            results = pipe.execute()
+    def rate_limit_check_many(self, keys: List[str], limit: int, window: int) -> List[dict]:
+        """
+        批量检查速率限制（所有键在一次管道往返中完成）
 
-            current = results[0]
-            allowed = current <= limit
-            remaining = max(0, limit - current)
+        Args:
+            keys: 限制键名列表
+            limit: 限制次数
+            window: 时间窗口（秒）
 
-            # 获取TTL来计算重置时间
-            ttl = self.client.ttl(rate_key)
-            reset_time = int(time.time()) + max(ttl, 0) if ttl > 0 else 0
+        Returns:
+            list: 与keys一一对应的结果，格式同 rate_limit_check
+        """
+        fallback = {'allowed': True, 'current': 0, 'remaining': limit, 'reset_time': 0}
+        if not keys or not self.is_connected():
+            return [dict(fallback) for _ in keys]
 
-            return {
-                'allowed': allowed,
-                'current': current,
-                'remaining': remaining,
-                'reset_time': reset_time
-            }
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            for key in keys:
+                self._rate_script(keys=[f"rate_limit:{key}"], args=[window], client=pipe)
+            results = pipe.execute()
+            self._mark_ok()
+            return [self._rate_limit_result(current, ttl, limit) for current, ttl in results]
         except Exception as e:
-            logger.error(f"Redis速率限制检查失败 {key}: {e}")
-            return {'allowed': True, 'current': 0, 'remaining': limit, 'reset_time': 0}
+            logger.error("Redis批量速率限制检查失败 (%s 个键): %s", len(keys), e)
+            return [dict(fallback) for _ in keys]
+
+    @staticmethod
+    def _rate_limit_result(current: int, ttl: int, limit: int) -> dict:
+        """根据计数和TTL构造速率限制结果"""
+        return {
+            'allowed': current <= limit,
+            'current': current,
+            'remaining': max(0, limit - current),
+            'reset_time': int(time.time()) + ttl if ttl > 0 else 0
+        }
 
     # 热门内容统计
     def increment_view_count(self, entry_id: str) -> Optional[int]:
@@ -265,14 +572,20 @@ class RedisClient:
         count = self.get(f"views:{entry_id}")
         return int(count) if count else 0
 
-    def get_hot_entries(self, limit: int = 10) -> list:
-        """获取热门条目（基于浏览次数）"""
+    def get_hot_entries(self, limit: int = 10, batch_size: int = 1000) -> list:
+        """获取热门条目（基于浏览次数）
+
+        Args:
+            limit: 返回的条目数量
+            batch_size: 每次SCAN遍历的键数量提示
+        """
         if not self.is_connected():
             return []
 
         try:
-            # 获取所有浏览统计键
-            keys = self.client.keys("views:*")
+            # 用SCAN增量遍历浏览统计键，避免KEYS阻塞Redis主线程；
+            # SCAN可能重复返回同一个键，按首次出现的顺序去重
+            keys = list(dict.fromkeys(self.client.scan_iter(match="views:*", count=batch_size)))
             if not keys:
                 return []
 
@@ -281,25 +594,30 @@ class RedisClient:
             for key in keys:
                 pipe.get(key)
             values = pipe.execute()
+            self._mark_ok()
 
-            # 组合并排序
-            entries = []
-            for key, value in zip(keys, values):
-                entry_id = key.replace("views:", "")
-                view_count = int(value) if value else 0
-                entries.append({'entry_id': entry_id, 'view_count': view_count})
+            # numpy只在这里用到，按需导入，避免每个进程启动时都加载
+            import numpy as np
 
-            # 按浏览次数排序并返回前N个
-            entries.sort(key=lambda x: x['view_count'], reverse=True)
-            return entries[:limit]
+            # 用partition做O(N)的Top-K选择：先求第K大的浏览次数，只对不小于它的候选排序；
+            # 候选按键的原始顺序排列，再做稳定排序，次数相同时仍保持键顺序，结果确定
+            counts = np.fromiter((int(v) if v else 0 for v in values), dtype=np.int64, count=len(values))
+            limit = min(limit, len(counts))
+            if limit <= 0:
+                return []
+            kth = -np.partition(-counts, limit - 1)[limit - 1]
+            candidates = np.flatnonzero(counts >= kth)
+            top = candidates[np.argsort(-counts[candidates], kind='stable')][:limit]
+
+            return [
+                {'entry_id': keys[i].replace("views:", ""), 'view_count': int(counts[i])}
+                for i in top
+            ]
         except Exception as e:
-            logger.error(f"获取热门条目失败: {e}")
+            logger.error("获取热门条目失败: %s", e)
             return []
 
     def close(self):
         """关闭Redis连接"""
         if self.client:
             self.client.close()
-
-# 添加时间模块导入
-import time
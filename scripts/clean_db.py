@@ -1,5 +1,4 @@
 import psycopg2
-from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
 
 def clean_database():
     """彻底清理数据库"""
@@ -16,7 +15,6 @@ def clean_database():
     try:
         # 连接数据库
         conn = psycopg2.connect(**DB_CONFIG)
-        conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
         cursor = conn.cursor()
 
         print("🔍 检查现有表...")
@@ -27,16 +25,37 @@ def clean_database():
             WHERE schemaname = 'public';
         """)
 
-        tables = cursor.fetchall()
-        print(f"现有表: {[table[0] for table in tables]}")
+        tables = [table[0] for table in cursor.fetchall()]
+        print(f"现有表: {tables}")
 
-        # 删除所有表
-        for table in tables:
-            table_name = table[0]
-            if table_name != 'alembic_version':  # 保留迁移版本表
-                print(f"🗑️  删除表: {table_name}")
-                cursor.execute(f"DROP TABLE IF EXISTS {table_name} CASCADE;")
+        # 保留迁移版本表：先读出版本号，重建schema后再写回
+        alembic_versions = []
+        if 'alembic_version' in tables:
+            cursor.execute("SELECT version_num FROM alembic_version;")
+            alembic_versions = [row[0] for row in cursor.fetchall()]
 
+        # 在一个事务中一次性重置schema，代替逐表DROP
+        print(f"🗑️  删除 {len([t for t in tables if t != 'alembic_version'])} 个表...")
+        cursor.execute("""
+            DROP SCHEMA public CASCADE;
+            CREATE SCHEMA public;
+            GRANT ALL ON SCHEMA public TO utopia_user;
+            GRANT ALL ON SCHEMA public TO public;
+        """)
+
+        if alembic_versions:
+            cursor.execute("""
+                CREATE TABLE alembic_version (
+                    version_num VARCHAR(32) NOT NULL,
+                    CONSTRAINT alembic_version_pkc PRIMARY KEY (version_num)
+                );
+            """)
+            cursor.executemany(
+                "INSERT INTO alembic_version (version_num) VALUES (%s);",
+                [(version,) for version in alembic_versions]
+            )
+
+        conn.commit()
         print("✅ 数据库清理完成")
 
         cursor.close()
@@ -1,7 +1,10 @@
 import sys
 import os
+import re
+import io
+import contextlib
 import subprocess
-import importlib
+from importlib.metadata import distributions
 
 def check_python_env():
     """检查Python环境"""
@@ -13,43 +16,41 @@ def check_python_env():
     print(f"工作目录: {os.getcwd()}")
     print()
 
+def _normalize_package_name(name):
+    """规范化包名（PEP 503），使 Flask_SQLAlchemy 与 flask-sqlalchemy 等价"""
+    return re.sub(r'[-_.]+', '-', name).lower()
+
 def check_required_packages():
     """检查必需的包"""
     print("📦 依赖包检查")
     print("-" * 30)
 
+    # 使用发行包名（与requirements.txt一致），只读取元数据，不执行导入
     required_packages = [
-        'flask', 'flask_sqlalchemy', 'flask_jwt_extended',
-        'flask_cors', 'flask_limiter', 'flask_migrate',
-        'psycopg2', 'neo4j', 'redis', 'requests',
+        'flask', 'flask-sqlalchemy', 'flask-jwt-extended',
+        'flask-cors', 'flask-limiter', 'flask-migrate',
+        'psycopg2-binary', 'neo4j', 'redis', 'requests',
         'pytest', 'pytest-cov'
     ]
 
     missing_packages = []
     version_info = {}
 
+    # 一次遍历所有已安装发行包，按规范化名称建立索引
+    installed = {}
+    for dist in distributions():
+        name = dist.metadata['Name']
+        if name:
+            installed.setdefault(_normalize_package_name(name), dist.version)
+
     for package in required_packages:
-        try:
-            # 特殊处理带下划线的包名
-            import_name = package.replace('-', '_').replace('flask_', 'flask.')
-            if import_name == 'flask.sqlalchemy':
-                import_name = 'flask_sqlalchemy'
-            elif import_name == 'flask.jwt_extended':
-                import_name = 'flask_jwt_extended'
-            elif import_name == 'flask.cors':
-                import_name = 'flask_cors'
-            elif import_name == 'flask.limiter':
-                import_name = 'flask_limiter'
-            elif import_name == 'flask.migrate':
-                import_name = 'flask_migrate'
-            elif import_name == 'pytest_cov':
-                import_name = 'pytest_cov'
-
-            module = importlib.import_module(import_name)
-            version = getattr(module, '__version__', 'Unknown')
+        # psycopg2-binary 与源码版 psycopg2 均可
+        version = (installed.get(_normalize_package_name(package))
+                   or installed.get(_normalize_package_name(package.replace('-binary', ''))))
+        if version:
             version_info[package] = version
             print(f"✅ {package}: {version}")
-        except ImportError:
+        else:
             missing_packages.append(package)
             print(f"❌ {package}: 未安装")
 
@@ -102,15 +103,14 @@ def check_test_files():
     for test_file in test_files:
         if os.path.exists(test_file):
             print(f"✅ {test_file} 存在")
-            # 检查文件是否为空
+            # 检查文件是否为空（只stat，不读取内容）
             try:
-                with open(test_file, 'r') as f:
-                    content = f.read().strip()
-                    if content:
-                        print(f"   内容: {len(content)} 字符")
-                    else:
-                        print(f"   ⚠️ 文件为空")
-            except Exception as e:
+                size = os.stat(test_file).st_size
+                if size > 0:
+                    print(f"   内容: {size} 字节")
+                else:
+                    print(f"   ⚠️ 文件为空")
+            except OSError as e:
                 print(f"   ❌ 读取失败: {e}")
         else:
             print(f"❌ {test_file} 缺失")
@@ -149,6 +149,35 @@ def run_simple_test():
     print("\n🎯 简单测试运行")
     print("-" * 30)
 
+    try:
+        import pytest
+    except ImportError:
+        # 当前解释器中没有pytest时，退回到调用外部pytest命令
+        return _run_simple_test_subprocess()
+
+    try:
+        print(f"✅ pytest版本: pytest {pytest.__version__}")
+
+        # 在当前进程中收集测试，避免重新启动解释器和重复导入应用
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+            exit_code = pytest.main(['--collect-only', '-q'])
+
+        if exit_code == 0:
+            print("✅ 测试收集成功")
+            print(f"   收集信息: {output.getvalue().strip()}")
+        else:
+            print("❌ 测试收集失败")
+            print(f"   错误: {output.getvalue().strip()}")
+            return False
+
+        return True
+    except Exception as e:
+        print(f"❌ 测试运行异常: {e}")
+        return False
+
+def _run_simple_test_subprocess():
+    """通过外部pytest命令运行简单测试"""
     try:
         # 运行pytest --version
         result = subprocess.run(['pytest', '--version'],
@@ -241,29 +241,70 @@ INITIAL_TAGS = [
     }
 ]
 
-# 关系数据
+# 关系数据：由各标签的 parent_id 得出 (子标签ID, 父标签ID)
 TAG_RELATIONSHIPS = [
-    ('existence', 'root'),
-    ('consciousness', 'root'),
-    ('life', 'existence'),
-    ('animalia', 'life'),
-    ('plantae', 'life'),
-    ('chordata', 'animalia'),
-    ('mammalia', 'chordata'),
-    ('aves', 'chordata'),
-    ('felidae', 'mammalia'),
-    ('felis_catus', 'felidae'),
-    ('panthera_tigris', 'felidae'),
-    ('artificial', 'existence'),
-    ('architecture', 'artificial'),
-    ('residential_building', 'architecture'),
-    ('emotions', 'consciousness'),
-    ('happiness', 'emotions'),
-    ('sadness', 'emotions'),
-    ('memories', 'consciousness'),
-    ('dreams', 'consciousness')
+    (tag['id'], tag['parent_id'])
+    for tag in INITIAL_TAGS
+    if 'parent_id' in tag
 ]
 
+# 初始化脚本只执行少量顺序查询：连接池保持很小，获取连接超时要短，避免掩盖死锁；
+# 可通过环境变量覆盖
+INIT_NEO4J_POOL_SIZE = int(os.environ.get('NEO4J_POOL_SIZE', 10))
+INIT_NEO4J_ACQUISITION_TIMEOUT = float(os.environ.get('NEO4J_ACQUISITION_TIMEOUT', 5.0))
+INIT_NEO4J_MAX_RETRY_TIME = float(os.environ.get('NEO4J_MAX_RETRY_TIME', 15.0))
+# 验证查询一次取回全部记录，不分批拉取
+INIT_NEO4J_FETCH_SIZE = 1000
+
+# 以下Cypher均为模块级常量，只通过 $参数 传值、不做字符串拼接，
+# 语句文本每次运行都完全相同，可以命中服务端的查询计划缓存
+
+# 清空现有标签
+DELETE_ALL_TAGS_CYPHER = "MATCH (t:Tag) DETACH DELETE t"
+
+# 标签ID唯一约束及父ID索引
+TAG_ID_CONSTRAINT_CYPHER = "CREATE CONSTRAINT tag_id_unique IF NOT EXISTS FOR (t:Tag) REQUIRE t.id IS UNIQUE"
+TAG_PARENT_ID_INDEX_CYPHER = "CREATE INDEX tag_parent_id IF NOT EXISTS FOR (t:Tag) ON (t.parent_id)"
+
+# 批量创建标签
+CREATE_TAGS_CYPHER = """
+    UNWIND $batch AS row
+    CREATE (t:Tag)
+    SET t = row
+    RETURN t.id AS id
+"""
+
+# 批量建立标签父子关系：(parent)-[:CONTAINS]->(child)
+CREATE_TAG_RELATIONSHIPS_CYPHER = """
+    UNWIND $pairs AS pair
+    MATCH (child:Tag {id: pair.child}), (parent:Tag {id: pair.parent})
+    WHERE child.status <> 'deleted' AND parent.status <> 'deleted'
+    CREATE (parent)-[:CONTAINS {created_at: datetime()}]->(child)
+    RETURN pair.child AS child, pair.parent AS parent
+"""
+
+# 初始化结果验证：总标签数，以及每个根标签的直接子标签数
+VERIFY_TAG_TREE_CYPHER = """
+    MATCH (t:Tag)
+    WITH count(t) AS total
+    OPTIONAL MATCH (root:Tag)
+    WHERE (root.level = 0 OR NOT (root)<-[:CONTAINS]-())
+    AND root.status <> 'deleted'
+    OPTIONAL MATCH (root)-[:CONTAINS]->(child:Tag)
+    WHERE child.status <> 'deleted'
+    RETURN total, root.id AS id, root.name AS name, count(child) AS child_count
+    ORDER BY name
+"""
+
+def create_tags_and_relationships(tx, tag_batch, relationship_pairs):
+    """在同一个写事务中批量创建标签和父子关系，返回实际创建的标签ID集合和 (子, 父) 关系集合"""
+    created_ids = {record['id'] for record in tx.run(CREATE_TAGS_CYPHER, batch=tag_batch)}
+    created_pairs = {
+        (record['child'], record['parent'])
+        for record in tx.run(CREATE_TAG_RELATIONSHIPS_CYPHER, pairs=relationship_pairs)
+    }
+    return created_ids, created_pairs
+
 def init_tags():
     """初始化标签数据"""
     print("🚀 开始初始化标签数据...")
@@ -277,7 +318,10 @@ def init_tags():
             neo4j_client = Neo4jClient(
                 app.config['NEO4J_URI'],
                 app.config['NEO4J_USER'],
-                app.config['NEO4J_PASSWORD']
+                app.config['NEO4J_PASSWORD'],
+                max_connection_pool_size=INIT_NEO4J_POOL_SIZE,
+                connection_acquisition_timeout=INIT_NEO4J_ACQUISITION_TIMEOUT,
+                max_transaction_retry_time=INIT_NEO4J_MAX_RETRY_TIME
             )
 
             if not neo4j_client or not neo4j_client.is_connected():
@@ -290,94 +334,84 @@ def init_tags():
 
             print("✅ Neo4j连接成功")
 
+            # 先清空旧标签并确保约束存在，再在同一个会话的一个写事务中
+            # 批量创建标签和父子关系，只提交一次
+            now_iso = datetime.utcnow().isoformat()
+            default_data = {
+                'status': 'active',
+                'quality_score': 8.0,
+                'usage_count': 0,
+                'current_version': 1,
+                'created_by': 'system',
+                'created_at': now_iso,
+                'last_modified_by': 'system',
+                'last_modified_at': now_iso,
+                'contributor_count': 1,
+                'edit_count': 0,
+                'aliases': [],
+                'applicable_content_types': ['text', 'image', 'video', 'audio']
+            }
+            tag_batch = [{**default_data, **tag_data} for tag_data in INITIAL_TAGS]
+            relationship_pairs = [
+                {'child': child_id, 'parent': parent_id}
+                for child_id, parent_id in TAG_RELATIONSHIPS
+            ]
+
             # 清空现有标签（小心使用）
             print("🗑️ 清空现有标签...")
-            with neo4j_client.driver.session() as session:
-                session.run("MATCH (t:Tag) DETACH DELETE t")
-
-            # 创建标签
-            print("📝 开始创建标签...")
-            created_count = 0
-            failed_tags = []
-
-            for tag_data in INITIAL_TAGS:
-                # 设置默认值
-                default_data = {
-                    'status': 'active',
-                    'quality_score': 8.0,
-                    'usage_count': 0,
-                    'current_version': 1,
-                    'created_by': 'system',
-                    'created_at': datetime.utcnow().isoformat(),
-                    'last_modified_by': 'system',
-                    'last_modified_at': datetime.utcnow().isoformat(),
-                    'contributor_count': 1,
-                    'edit_count': 0,
-                    'aliases': [],
-                    'applicable_content_types': ['text', 'image', 'video', 'audio']
-                }
-
-                # 合并数据
-                full_tag_data = {**default_data, **tag_data}
-
-                # 创建标签
+            neo4j_client.driver.execute_query(DELETE_ALL_TAGS_CYPHER)
+            # 标签ID唯一约束（同时建立索引），批量建立关系时按ID的MATCH走索引查找；
+            # Neo4j不允许在同一事务中混合结构变更和数据写入，因此单独执行
+            neo4j_client.driver.execute_query(TAG_ID_CONSTRAINT_CYPHER)
+            neo4j_client.driver.execute_query(TAG_PARENT_ID_INDEX_CYPHER)
+
+            with neo4j_client.driver.session(fetch_size=INIT_NEO4J_FETCH_SIZE) as session:
+                print("📝 开始创建标签并建立标签关系...")
+                created_ids = set()
+                created_pairs = set()
                 try:
-                    created_tag = neo4j_client.create_tag(full_tag_data)
-                    if created_tag:
-                        created_count += 1
-                        print(f"✅ 创建标签: {tag_data['name']}")
-                    else:
-                        failed_tags.append(tag_data['name'])
-                        print(f"❌ 创建标签失败: {tag_data['name']}")
+                    created_ids, created_pairs = session.execute_write(
+                        create_tags_and_relationships, tag_batch, relationship_pairs
+                    )
                 except Exception as e:
-                    failed_tags.append(tag_data['name'])
-                    print(f"❌ 创建标签异常: {tag_data['name']} - {e}")
-
-            print(f"\n📊 标签创建结果: {created_count}/{len(INITIAL_TAGS)} 成功")
-            if failed_tags:
-                print(f"❌ 失败的标签: {', '.join(failed_tags)}")
-
-            # 建立关系
-            print("\n🔗 开始建立标签关系...")
-            relationship_count = 0
-            failed_relationships = []
-
-            for child_id, parent_id in TAG_RELATIONSHIPS:
+                    print(f"❌ 批量创建标签异常: {e}")
+
+                created_count = len(created_ids)
+                failed_tags = [tag['name'] for tag in tag_batch if tag['id'] not in created_ids]
+                print(f"\n📊 标签创建结果: {created_count}/{len(INITIAL_TAGS)} 成功")
+                if failed_tags:
+                    print(f"❌ 失败的标签: {', '.join(failed_tags)}")
+
+                relationship_count = len(created_pairs)
+                failed_relationships = [
+                    f"{child_id} -> {parent_id}"
+                    for child_id, parent_id in TAG_RELATIONSHIPS
+                    if (child_id, parent_id) not in created_pairs
+                ]
+                print(f"\n📊 关系建立结果: {relationship_count}/{len(TAG_RELATIONSHIPS)} 成功")
+                if failed_relationships:
+                    print(f"❌ 失败的关系: {', '.join(failed_relationships)}")
+
+                # 验证结果
+                print("\n🔍 验证初始化结果...")
                 try:
-                    success = neo4j_client.create_tag_relationship(child_id, parent_id)
-                    if success:
-                        relationship_count += 1
-                        print(f"✅ 建立关系: {child_id} -> {parent_id}")
-                    else:
-                        failed_relationships.append(f"{child_id} -> {parent_id}")
-                        print(f"❌ 建立关系失败: {child_id} -> {parent_id}")
-                except Exception as e:
-                    failed_relationships.append(f"{child_id} -> {parent_id}")
-                    print(f"❌ 建立关系异常: {child_id} -> {parent_id} - {e}")
-
-            print(f"\n📊 关系建立结果: {relationship_count}/{len(TAG_RELATIONSHIPS)} 成功")
-            if failed_relationships:
-                print(f"❌ 失败的关系: {', '.join(failed_relationships)}")
-
-            # 验证结果
-            print("\n🔍 验证初始化结果...")
-            try:
-                root_tags = neo4j_client.get_root_tags()
-                print(f"   根标签数量: {len(root_tags)}")
-
-                for root in root_tags:
-                    children = neo4j_client.get_child_tags(root['id'])
-                    print(f"   {root['name']}: {len(children)} 个直接子标签")
-
-                # 统计总标签数
-                with neo4j_client.driver.session() as session:
-                    result = session.run("MATCH (t:Tag) RETURN count(t) as total")
-                    record = result.single()
-                    total_tags = record['total'] if record else 0
+                    # 一条查询同时得到总标签数、各根标签及其直接子标签数
+                    records = session.execute_read(lambda tx: list(tx.run(VERIFY_TAG_TREE_CYPHER)))
+                    root_tags = [record for record in records if record['id'] is not None]
+                    print(f"   根标签数量: {len(root_tags)}")
+
+                    # 各根标签的统计合并成一次输出
+                    if root_tags:
+                        print('\n'.join(
+                            f"   {root['name']}: {root['child_count']} 个直接子标签"
+                            for root in root_tags
+                        ))
+
+                    total_tags = records[0]['total'] if records else 0
                     print(f"   总标签数量: {total_tags}")
 
-            except Exception as e:
-                print(f"⚠️ 验证过程出错: {e}")
+                except Exception as e:
+                    print(f"⚠️ 验证过程出错: {e}")
 
             # 关闭连接
             neo4j_client.close()
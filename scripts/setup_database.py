@@ -1,5 +1,6 @@
 import os
 import sys
+import uuid
 import psycopg2
 from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
 
@@ -7,8 +8,15 @@ from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, project_root)
 
-def clean_database():
-    """清理数据库"""
+SEED_TABLES = ('entries', 'entry_tags', 'media_files', 'user_permissions', 'users')
+
+
+def clean_database(full=False):
+    """清理数据库
+
+    默认只清空种子数据相关的表，保留表/索引定义和统计信息；
+    full=True（或表尚未创建）时才重建整个 public schema。
+    """
     try:
         conn = psycopg2.connect(
             host='localhost',
@@ -20,13 +28,28 @@ def clean_database():
         conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
         cursor = conn.cursor()
 
-        print("🗑️ 清理数据库...")
-        cursor.execute("""
-            DROP SCHEMA public CASCADE;
-            CREATE SCHEMA public;
-            GRANT ALL ON SCHEMA public TO utopia_user;
-            GRANT ALL ON SCHEMA public TO public;
-        """)
+        if not full:
+            # 表还没建过（全新数据库）时只能走完整重建
+            cursor.execute(
+                "SELECT count(*) FROM unnest(%s::text[]) AS t(name) "
+                "WHERE to_regclass('public.' || t.name) IS NOT NULL",
+                (list(SEED_TABLES),)
+            )
+            full = cursor.fetchone()[0] < len(SEED_TABLES)
+
+        if full:
+            print("🗑️ 重建数据库schema...")
+            cursor.execute("""
+                DROP SCHEMA public CASCADE;
+                CREATE SCHEMA public;
+                GRANT ALL ON SCHEMA public TO utopia_user;
+                GRANT ALL ON SCHEMA public TO public;
+            """)
+        else:
+            print("🗑️ 清空数据表...")
+            cursor.execute(
+                f"TRUNCATE TABLE {', '.join(SEED_TABLES)} RESTART IDENTITY CASCADE"
+            )
 
         cursor.close()
         conn.close()
@@ -37,12 +60,12 @@ def clean_database():
         print(f"❌ 数据库清理失败: {e}")
         return False
 
-def setup_complete_database():
+def setup_complete_database(full=False):
     """设置完整数据库"""
     print("🚀 开始设置虚拟乌托邦数据库（完整版）...")
 
     # 清理数据库
-    if not clean_database():
+    if not clean_database(full=full):
         return False
 
     # 创建Flask应用
@@ -55,78 +78,75 @@ def setup_complete_database():
             from app.models.user import User, UserPermission
             from app.models.entry import Entry, EntryTag
             from app.models.media import MediaFile
+            from sqlalchemy import insert
+            from werkzeug.security import generate_password_hash
 
             print("📋 创建数据库表...")
             db.create_all()
             print("✅ 数据库表创建成功")
 
-            # 创建测试用户
+            # 各表的行先在内存中组装好（ID在客户端生成），每张表一次批量INSERT
+            test_user = {
+                'id': str(uuid.uuid4()),
+                'username': 'testuser',
+                'email': 'test@example.com',
+                'password_hash': generate_password_hash('password123'),
+                'nickname': '测试用户',
+                'bio': '这是一个测试用户账号，用于开发和测试'
+            }
+            admin_user = {
+                'id': str(uuid.uuid4()),
+                'username': 'admin',
+                'email': 'admin@utopia.com',
+                'password_hash': generate_password_hash('admin123'),
+                'nickname': '管理员',
+                'bio': '系统管理员账号'
+            }
+
+            # 创建测试用户和管理员用户
             print("👤 创建测试用户...")
-            test_user = User(
-                username='testuser',
-                email='test@example.com',
-                nickname='测试用户',
-                bio='这是一个测试用户账号，用于开发和测试'
-            )
-            test_user.set_password('password123')
-
-            db.session.add(test_user)
-            db.session.flush()
-
-            # 创建用户权限
-            permissions = UserPermission(
-                user_id=test_user.id,
-                can_create_tags=True,
-                can_edit_tags=True,
-                can_approve_changes=False,
-                max_edits_per_day=100
-            )
-            db.session.add(permissions)
-
-            # 创建管理员用户
             print("👑 创建管理员用户...")
-            admin_user = User(
-                username='admin',
-                email='admin@utopia.com',
-                nickname='管理员',
-                bio='系统管理员账号'
-            )
-            admin_user.set_password('admin123')
-
-            db.session.add(admin_user)
-            db.session.flush()
+            db.session.execute(insert(User), [test_user, admin_user])
 
-            admin_permissions = UserPermission(
-                user_id=admin_user.id,
-                can_create_tags=True,
-                can_edit_tags=True,
-                can_approve_changes=True,
-                max_edits_per_day=1000
-            )
-            db.session.add(admin_permissions)
+            # 创建用户权限
+            db.session.execute(insert(UserPermission), [
+                {
+                    'user_id': test_user['id'],
+                    'can_create_tags': True,
+                    'can_edit_tags': True,
+                    'can_approve_changes': False,
+                    'max_edits_per_day': 100
+                },
+                {
+                    'user_id': admin_user['id'],
+                    'can_create_tags': True,
+                    'can_edit_tags': True,
+                    'can_approve_changes': True,
+                    'max_edits_per_day': 1000
+                }
+            ])
 
             # 创建示例图鉴条目
             print("📝 创建示例图鉴条目...")
-            sample_entry = Entry(
-                user_id=test_user.id,
-                title="我的第一个图鉴条目",
-                content="这是一个示例图鉴条目，用于测试系统功能。",
-                content_type="text",
-                location_name="测试地点",
-                mood_score=8,
-                visibility="public"
-            )
-            db.session.add(sample_entry)
-            db.session.flush()
+            sample_entry = {
+                'id': str(uuid.uuid4()),
+                'user_id': test_user['id'],
+                'title': "我的第一个图鉴条目",
+                'content': "这是一个示例图鉴条目，用于测试系统功能。",
+                'content_type': "text",
+                'location_name': "测试地点",
+                'mood_score': 8,
+                'visibility': "public"
+            }
+            db.session.execute(insert(Entry), [sample_entry])
 
             # 为示例条目添加标签
-            sample_tag = EntryTag(
-                entry_id=sample_entry.id,
-                tag_id="test_tag",
-                tagged_by=test_user.id,
-                source="manual"
-            )
-            db.session.add(sample_tag)
+            db.session.execute(insert(EntryTag), [{
+                'entry_id': sample_entry['id'],
+                'tag_id': "test_tag",
+                'tagged_by': test_user['id'],
+                'source': "manual"
+            }])
 
             # 提交所有更改
             db.session.commit()
@@ -134,20 +154,20 @@ def setup_complete_database():
             print("✅ 数据库设置完成！")
             print("\n📋 创建的账号:")
             print("  👤 测试用户:")
-            print(f"     用户名: {test_user.username}")
-            print(f"     邮箱: {test_user.email}")
+            print(f"     用户名: {test_user['username']}")
+            print(f"     邮箱: {test_user['email']}")
             print("     密码: password123")
-            print(f"     ID: {test_user.id}")
+            print(f"     ID: {test_user['id']}")
 
             print("  👑 管理员:")
-            print(f"     用户名: {admin_user.username}")
-            print(f"     邮箱: {admin_user.email}")
+            print(f"     用户名: {admin_user['username']}")
+            print(f"     邮箱: {admin_user['email']}")
             print("     密码: admin123")
-            print(f"     ID: {admin_user.id}")
+            print(f"     ID: {admin_user['id']}")
 
             print(f"\n📝 示例图鉴条目:")
-            print(f"     标题: {sample_entry.title}")
-            print(f"     ID: {sample_entry.id}")
+            print(f"     标题: {sample_entry['title']}")
+            print(f"     ID: {sample_entry['id']}")
 
             return True
 
@@ -159,7 +179,8 @@ def setup_complete_database():
             return False
 
 if __name__ == '__main__':
-    success = setup_complete_database()
+    # --full: 有新的表结构变更时，重建整个schema而不是只清空数据
+    success = setup_complete_database(full='--full' in sys.argv[1:])
     if success:
         print("\n🎉 数据库设置成功！现在可以启动应用了:")
         print("   python app.py")
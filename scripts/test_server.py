@@ -8,9 +8,13 @@ def test_server_startup():
     """测试服务器启动状态"""
     print("🧪 测试服务器状态...")
 
+    # 所有请求复用同一个会话，保持长连接，避免每个请求重新建立TCP连接
+    session = requests.Session()
+    session.headers.update({'Connection': 'keep-alive'})
+
     try:
         # 测试健康检查
-        response = requests.get(f"{BASE_URL}/health", timeout=5)
+        response = session.get(f"{BASE_URL}/health", timeout=5)
         if response.status_code == 200:
             data = response.json()
             print(f"✅ 服务器健康检查通过")
@@ -23,8 +27,7 @@ def test_server_startup():
                 "username": "testuser",
                 "password": "password123"
             }
-
-            response = requests.post(f"{BASE_URL}/api/auth/login", json=login_data)
+            response = session.post(f"{BASE_URL}/api/auth/login", json=login_data, timeout=5)
             if response.status_code == 200:
                 print("✅ 认证API正常工作")
 
@@ -33,7 +36,7 @@ def test_server_startup():
                 headers = {"Authorization": f"Bearer {token}"}
 
                 # 测试获取图鉴列表
-                response = requests.get(f"{BASE_URL}/api/entries", headers=headers)
+                response = session.get(f"{BASE_URL}/api/entries", headers=headers, timeout=5)
                 if response.status_code == 200:
                     print("✅ 图鉴API正常工作")
                     entries_data = response.json()['data']
@@ -56,6 +59,8 @@ def test_server_startup():
     except Exception as e:
         print(f"❌ 测试异常: {e}")
         return False
+    finally:
+        session.close()
 
     return False
 
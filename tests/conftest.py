@@ -4,13 +4,47 @@ import os
 import sys
 import uuid
 
+import orjson
+
 # 添加项目根目录到Python路径
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, project_root)
 
-from app import create_app, db, neo4j_client
+from flask import g
+from flask_jwt_extended import create_access_token
+from flask_sqlalchemy.session import Session
+from sqlalchemy import insert, text
+from sqlalchemy.orm import scoped_session, sessionmaker
+from werkzeug.security import generate_password_hash
+
+import app as app_module
+from app import create_app, db
+from app.config import TestingConfig
 from app.models.user import User, UserPermission
 
+# pytest-xdist 并行运行时，每个worker使用各自的测试用户和Neo4j测试标签，
+# 只清理自己的数据；串行运行时保持原有的名称
+XDIST_WORKER = os.environ.get('PYTEST_XDIST_WORKER', '')
+WORKER_SUFFIX = f'_{XDIST_WORKER}' if XDIST_WORKER else ''
+TEST_USERNAME = f'testuser{WORKER_SUFFIX}'
+TEST_EMAIL = f'test{WORKER_SUFFIX}@example.com'
+TEST_TAG_LABEL = f'TestTag{WORKER_SUFFIX}'
+TEST_TAG_CATEGORY = f'test{WORKER_SUFFIX}'
+
+# 并行运行时所有worker共用同一个测试数据库，建表用这把advisory lock串行化
+SCHEMA_LOCK_ID = 0x75746f70
+
+# 固定测试密码的哈希只在导入时计算一次，各测试模块创建用户时直接复用
+TEST_PASSWORD_HASH = generate_password_hash(
+    'password123', method=TestingConfig.PASSWORD_HASH_METHOD
+)
+
+class ConnectionBoundSession(Session):
+    """固定使用构造时传入的连接的会话（Flask-SQLAlchemy默认按引擎选择连接）"""
+
+    def get_bind(self, *args, **kwargs):
+        return self.bind
+
 @pytest.fixture(scope='session')
 def app():
     """创建测试应用"""
@@ -27,126 +61,267 @@ def app():
     })
 
     with app.app_context():
-        db.create_all()
+        # 测试不需要跨会话的一致性：关闭自动flush和提交后过期，省去隐式的SELECT往返；
+        # 需要确定写入顺序的地方显式 flush()。scoped_session 按应用上下文划分作用域，
+        # 必须在上下文内配置
+        db.session.configure(autoflush=False, expire_on_commit=False)
+        create_test_schema()
+        # 清理以往运行残留的测试数据；各测试自身的数据在事务回滚时丢弃
+        clean_test_data_safely()
+        ensure_neo4j_test_indexes()
+        clean_neo4j_test_data()
         yield app
 
-        # 清理资源
-        db.drop_all()
+        # 清理资源；本次运行创建的Neo4j测试标签在会话结束时一次删除
+        clean_neo4j_test_data()
+        # 并行运行时其他worker可能仍在使用这些表，只在串行运行时删表；
+        # 测试数据本身已随各测试的事务回滚
+        if not XDIST_WORKER:
+            db.drop_all()
 
         # 清理Neo4j连接
-        if neo4j_client:
-            neo4j_client.close()
+        if app_module.neo4j_client:
+            app_module.neo4j_client.close()
+
+def connected_neo4j_client():
+    """返回可用的Neo4j客户端，不可用时返回None
+
+    init_clients() 只重新绑定 app 模块上的 neo4j_client，因此每次调用时从模块读取，
+    不能在导入时 from app import neo4j_client（那时它还是None）
+    """
+    neo4j_client = app_module.neo4j_client
+    if neo4j_client and neo4j_client.is_connected():
+        return neo4j_client
+    return None
+
+def create_test_schema():
+    """创建测试表结构
+
+    PostgreSQL 上在同一事务中先取得 advisory lock 再建表，多个worker同时启动时
+    依次执行，后来者的 checkfirst 能看到已提交的表，不会在系统目录上发生冲突
+    """
+    with db.engine.begin() as conn:
+        if conn.dialect.name == 'postgresql':
+            conn.execute(text('SELECT pg_advisory_xact_lock(:lock_id)'), {'lock_id': SCHEMA_LOCK_ID})
+        db.metadata.create_all(bind=conn)
 
-@pytest.fixture(scope='function')
+@pytest.fixture(scope='session')
 def client(app):
     """创建测试客户端"""
     return app.test_client()
 
-# conftest.py - 最终推荐版本
 @pytest.fixture(scope='function', autouse=True)
-def clean_db(app):
-    """每个测试前后清理数据库"""
-    with app.app_context():
-        # 测试前清理
-        clean_test_data_safely()
-        clean_neo4j_test_data()
+def db_session(app):
+    """每个测试在一个外层事务中运行，测试结束时整体回滚
 
-        yield
+    测试期间的 commit 只提交到保存点（SAVEPOINT），无需在测试前后逐表删除数据
+    """
+    connection = db.engine.connect()
+    transaction = connection.begin()
+    original_session = db.session
+    # 会话按应用上下文划分作用域（与 db.session 一致）：测试函数与每个请求各自的应用上下文
+    # 使用各自的会话，请求结束时 Flask-SQLAlchemy 只移除该请求的会话。
+    # g 是每个应用上下文独有的对象，用它的id作为作用域键，不依赖库的内部实现。
+    # join_transaction_mode 需要 SQLAlchemy 2.0
+    db.session = scoped_session(
+        sessionmaker(
+            class_=ConnectionBoundSession,
+            db=db,
+            bind=connection,
+            join_transaction_mode='create_savepoint',
+            autoflush=False,
+            expire_on_commit=False
+        ),
+        scopefunc=lambda: id(g._get_current_object())
+    )
 
-        # 测试后清理
-        clean_test_data_safely()
-        clean_neo4j_test_data()
+    yield db.session
+
+    db.session.remove()
+    db.session = original_session
+    transaction.rollback()
+    connection.close()
+
+@pytest.fixture(scope='session')
+def neo4j_session(app):
+    """每个worker共用一个Neo4j会话，测试数据的写入都经由它执行；Neo4j不可用时为None"""
+    neo4j_client = connected_neo4j_client()
+    if neo4j_client is None:
+        yield None
+        return
+
+    with neo4j_client.get_session() as session:
+        yield session
 
 def clean_test_data_safely():
     """安全地清理测试数据"""
     try:
-        from app.models.user import User
+        from app.models.entry import Entry, EntryTag
+        from app.models.media import MediaFile
 
         # 只删除测试用户及其相关数据
-        # SQLAlchemy的cascade会自动处理相关数据的删除
-        test_users = User.query.filter(
-            db.or_(
+        # 按外键依赖顺序直接批量删除，不逐个加载对象走ORM级联
+        if XDIST_WORKER:
+            # 并行运行时只清理本worker的测试用户，避免删掉其他worker正在使用的数据
+            is_test_user = db.or_(
+                User.email == TEST_EMAIL,
+                User.username == TEST_USERNAME
+            )
+        else:
+            is_test_user = db.or_(
                 User.email.like('%test%'),
                 User.username.like('%test%')
             )
-        ).all()
+        test_user_ids = db.select(User.id).where(is_test_user)
+        test_entry_ids = db.select(Entry.id).where(Entry.user_id.in_(test_user_ids))
 
-        for user in test_users:
-            db.session.delete(user)  # 会级联删除相关的Entry、UserPermission等
+        MediaFile.query.filter(MediaFile.entry_id.in_(test_entry_ids)).delete(synchronize_session=False)
+        EntryTag.query.filter(EntryTag.entry_id.in_(test_entry_ids)).delete(synchronize_session=False)
+        Entry.query.filter(Entry.user_id.in_(test_user_ids)).delete(synchronize_session=False)
+        UserPermission.query.filter(UserPermission.user_id.in_(test_user_ids)).delete(synchronize_session=False)
+        deleted_count = User.query.filter(User.id.in_(test_user_ids)).delete(synchronize_session=False)
 
         db.session.commit()
-        if test_users:
-            print(f"清理了 {len(test_users)} 个测试用户及其相关数据")
+        if deleted_count:
+            print(f"清理了 {deleted_count} 个测试用户及其相关数据")
 
     except Exception as e:
         db.session.rollback()
         print(f"数据库清理失败: {e}")
         # 测试继续进行，不抛出异常
 
+def ensure_neo4j_test_indexes():
+    """为测试数据清理用到的属性建索引（schema操作不能与数据写入共用事务，单独执行）"""
+    neo4j_client = connected_neo4j_client()
+    if neo4j_client is None:
+        return
+
+    try:
+        neo4j_client.driver.execute_query(
+            "CREATE INDEX tag_category IF NOT EXISTS FOR (t:Tag) ON (t.category)"
+        )
+    except Exception as e:
+        print(f"创建Neo4j测试索引失败: {e}")
+
+# 标签名无法参数化，只在导入时拼接一次，语句文本在整个运行期间保持不变
+CLEAN_NEO4J_TEST_DATA_CYPHER = f"""
+    CALL {{
+        MATCH (t:{TEST_TAG_LABEL}) RETURN t
+        UNION
+        MATCH (t:Tag {{category: $category}}) RETURN t
+    }}
+    DETACH DELETE t
+"""
+
 def clean_neo4j_test_data():
-    """清理Neo4j中的测试数据"""
-    if not neo4j_client or not neo4j_client.is_connected():
+    """清理Neo4j中的测试数据
+
+    测试直接写入的标签都带 TEST_TAG_LABEL 标签，只扫描这部分节点；
+    经由API创建的测试标签统一使用 category=TEST_TAG_CATEGORY，走 Tag(category) 索引
+    """
+    neo4j_client = connected_neo4j_client()
+    if neo4j_client is None:
         return
 
     try:
-        with neo4j_client.get_session() as session:
-            # 删除所有测试相关标签
-            session.run("""
-                MATCH (t:Tag)
-                WHERE t.name CONTAINS '测试' 
-                OR t.name CONTAINS 'Test'
-                OR t.category = 'test'
-                OR t.id STARTS WITH 'test_'
-                OR t.name_en CONTAINS 'Test'
-                DETACH DELETE t
-            """)
-            print("Neo4j测试数据清理完成")
+        neo4j_client.driver.execute_query(
+            CLEAN_NEO4J_TEST_DATA_CYPHER, category=TEST_TAG_CATEGORY
+        )
+        print("Neo4j测试数据清理完成")
     except Exception as e:
         print(f"清理Neo4j测试数据失败: {e}")
 
-@pytest.fixture
+@pytest.fixture(scope='session')
 def test_user(app):
-    """创建测试用户"""
+    """创建测试用户
+
+    整个测试会话（并行时每个worker）只创建一次，在各测试的回滚事务之外提交；
+    测试中对该用户的修改随各自的事务回滚，会话结束时删除该用户
+    """
+    user_row = {
+        'id': str(uuid.uuid4()),
+        'username': TEST_USERNAME,
+        'email': TEST_EMAIL,
+        'nickname': '测试用户',
+        'password_hash': TEST_PASSWORD_HASH,
+        'reputation_score': 0
+    }
+
+    # 用户ID在客户端生成，用户和权限各一次INSERT，无需flush取回主键
     with app.app_context():
-        user = User(
-            username='testuser',
-            email='test@example.com',
-            nickname='测试用户'
-        )
-        user.set_password('password123')
+        db.session.execute(insert(User), [user_row])
+        db.session.execute(insert(UserPermission), [{
+            'user_id': user_row['id'],
+            'can_create_tags': True,
+            'can_edit_tags': True,
+            'can_approve_changes': False,
+            'max_edits_per_day': 100
+        }])
+        db.session.commit()
 
-        db.session.add(user)
-        db.session.flush()
+    # 返回未绑定会话的用户对象，仅用于读取字段
+    user = User(**user_row)
 
-        permissions = UserPermission(
-            user_id=user.id,
-            can_create_tags=True,
-            can_edit_tags=True,
-            can_approve_changes=False,
-            max_edits_per_day=100
+    yield user
+
+    with app.app_context():
+        clean_test_data_safely()
+
+@pytest.fixture(scope='session')
+def auth_headers(app, test_user):
+    """获取认证头（整个测试会话生成一次）
+
+    直接签发与登录接口相同的访问令牌，不经过登录请求和密码校验；
+    登录接口本身由 test_auth.py 覆盖
+    """
+    with app.app_context():
+        token = create_access_token(
+            identity=test_user.id,
+            additional_claims={
+                'username': test_user.username,
+                'reputation': test_user.reputation_score
+            }
         )
-        db.session.add(permissions)
-        db.session.commit()
 
-        return user
+    return {'Authorization': f'Bearer {token}'}
 
-@pytest.fixture
-def auth_headers(client, test_user):
-    """获取认证头"""
-    login_data = {
-        'username': 'testuser',
-        'password': 'password123'
-    }
+# 创建图鉴条目用的固定数据
+ENTRY_FIXTURE_DATA = {
+    'title': '我的第一只猫',
+    'content': '今天遇到了一只很可爱的橙色小猫',
+    'content_type': 'mixed',
+    'location_name': '公园',
+    'geo_coordinates': '39.9042,116.4074',
+    'mood_score': 8,
+    'visibility': 'public',
+    'tags': ['felis_catus', 'happiness']
+}
+# 请求体在导入时序列化一次，各次创建直接发送同一份字节
+ENTRY_FIXTURE_BODY = orjson.dumps(ENTRY_FIXTURE_DATA)
 
-    response = client.post('/api/auth/login',
-                           json=login_data,
+@pytest.fixture
+def created_entry(client, auth_headers):
+    """通过接口创建一个图鉴条目并返回其ID（随测试事务回滚）"""
+    response = client.post('/api/entries',
+                           data=ENTRY_FIXTURE_BODY,
+                           headers=auth_headers,
                            content_type='application/json')
+    status, data = parse(response)
+    assert status == 201
+    return data['data']['entry']['id']
 
-    assert response.status_code == 200
-    data = response.get_json()
-    token = data['data']['tokens']['access_token']
+def parse(response):
+    """用orjson解析一次响应体，返回 (状态码, JSON数据)
 
-    return {'Authorization': f'Bearer {token}'}
+    非JSON响应（如框架返回的HTML错误页）数据为None，由调用方的状态码断言给出失败原因
+    """
+    return response.status_code, orjson.loads(response.data) if response.is_json else None
+
+def ok(response):
+    """解析一次响应JSON，断言业务成功并返回其中的 data 部分"""
+    _, data = parse(response)
+    assert data['success'] == True
+    return data['data']
 
 @pytest.fixture
 def unique_tag_name():
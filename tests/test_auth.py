@@ -1,6 +1,13 @@
 import pytest
 import json
 
+from tests.conftest import TEST_USERNAME, ok
+
+LOGIN_DATA = {
+    'username': TEST_USERNAME,
+    'password': 'password123'
+}
+
 def test_health_check(client):
     """测试健康检查"""
     response = client.get('/health')
@@ -24,35 +31,25 @@ def test_user_registration(client):
                            content_type='application/json')
 
     assert response.status_code == 201
-    data = response.get_json()
-    assert data['success'] == True
-    assert data['data']['user']['username'] == 'newuser'
+    assert ok(response)['user']['username'] == 'newuser'
 
 def test_user_login(client, test_user):
     """测试用户登录"""
-    login_data = {
-        'username': 'testuser',
-        'password': 'password123'
-    }
-
     response = client.post('/api/auth/login',
-                           json=login_data,
+                           json=LOGIN_DATA,
                            content_type='application/json')
 
     assert response.status_code == 200
-    data = response.get_json()
-    assert data['success'] == True
-    assert 'tokens' in data['data']
-    assert 'access_token' in data['data']['tokens']
+    data = ok(response)
+    assert 'tokens' in data
+    assert 'access_token' in data['tokens']
 
 def test_get_profile(client, auth_headers):
     """测试获取用户信息"""
     response = client.get('/api/auth/profile', headers=auth_headers)
 
     assert response.status_code == 200
-    data = response.get_json()
-    assert data['success'] == True
-    assert data['data']['user']['username'] == 'testuser'
+    assert ok(response)['user']['username'] == TEST_USERNAME
 
 def test_update_profile(client, auth_headers):
     """测试更新用户信息"""
@@ -67,9 +64,7 @@ def test_update_profile(client, auth_headers):
                           content_type='application/json')
 
     assert response.status_code == 200
-    data = response.get_json()
-    assert data['success'] == True
-    assert data['data']['user']['nickname'] == '更新后的昵称'
+    assert ok(response)['user']['nickname'] == '更新后的昵称'
 
 def test_login_invalid_credentials(client):
     """测试无效凭据登录"""
@@ -89,7 +84,7 @@ def test_login_invalid_credentials(client):
 def test_registration_duplicate_username(client, test_user):
     """测试重复用户名注册"""
     user_data = {
-        'username': 'testuser',  # 已存在的用户名
+        'username': TEST_USERNAME,  # 已存在的用户名
         'email': 'another@example.com',
         'password': 'password123'
     }
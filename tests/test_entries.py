@@ -2,50 +2,41 @@ import pytest
 import json
 from datetime import datetime
 
+from tests.conftest import ENTRY_FIXTURE_BODY, parse
+
+# 请求路径常量；带中文参数的搜索地址预先做好URL编码（q=猫）
+URL_ENTRIES = '/api/entries'
+URL_ENTRY = '/api/entries/{}'.format
+URL_ENTRIES_PAGE = '/api/entries?page=1&per_page=10'
+URL_MY_ENTRIES = '/api/entries/my'
+URL_SEARCH = '/api/entries/search?q=%E7%8C%AB'
+URL_MY_STATS = '/api/entries/my/stats'
+
 def test_create_entry(client, auth_headers):
     """测试创建图鉴条目"""
-    entry_data = {
-        'title': '我的第一只猫',
-        'content': '今天遇到了一只很可爱的橙色小猫',
-        'content_type': 'mixed',
-        'location_name': '公园',
-        'geo_coordinates': '39.9042,116.4074',
-        'mood_score': 8,
-        'visibility': 'public',
-        'tags': ['felis_catus', 'happiness']
-    }
-
-    response = client.post('/api/entries',
-                           json=entry_data,
+    response = client.post(URL_ENTRIES,
+                           data=ENTRY_FIXTURE_BODY,
                            headers=auth_headers,
                            content_type='application/json')
 
-    assert response.status_code == 201
-    data = response.get_json()
+    status, data = parse(response)
+    assert status == 201
     assert data['success'] == True
     assert data['data']['entry']['title'] == '我的第一只猫'
     assert data['data']['entry']['mood_score'] == 8
 
-    return data['data']['entry']['id']
-
-def test_get_entry(client, auth_headers):
+def test_get_entry(client, created_entry):
     """测试获取图鉴条目"""
-    # 先创建一个条目
-    entry_id = test_create_entry(client, auth_headers)
-
     # 获取条目
-    response = client.get(f'/api/entries/{entry_id}')
+    response = client.get(URL_ENTRY(created_entry))
 
-    assert response.status_code == 200
-    data = response.get_json()
+    status, data = parse(response)
+    assert status == 200
     assert data['success'] == True
-    assert data['data']['entry']['id'] == entry_id
+    assert data['data']['entry']['id'] == created_entry
 
-def test_update_entry(client, auth_headers):
+def test_update_entry(client, auth_headers, created_entry):
     """测试更新图鉴条目"""
-    # 先创建一个条目
-    entry_id = test_create_entry(client, auth_headers)
-
     # 更新条目
     update_data = {
         'title': '我的第一只猫（更新版）',
@@ -53,66 +44,54 @@ def test_update_entry(client, auth_headers):
         'mood_score': 9
     }
 
-    response = client.put(f'/api/entries/{entry_id}',
+    response = client.put(URL_ENTRY(created_entry),
                           json=update_data,
                           headers=auth_headers,
                           content_type='application/json')
 
-    assert response.status_code == 200
-    data = response.get_json()
+    status, data = parse(response)
+    assert status == 200
     assert data['success'] == True
     assert data['data']['entry']['title'] == '我的第一只猫（更新版）'
     assert data['data']['entry']['mood_score'] == 9
 
-def test_get_entries_list(client, auth_headers):
+def test_get_entries_list(client, created_entry):
     """测试获取图鉴列表"""
-    # 先创建几个条目
-    test_create_entry(client, auth_headers)
-
     # 获取列表
-    response = client.get('/api/entries?page=1&per_page=10')
+    response = client.get(URL_ENTRIES_PAGE)
 
-    assert response.status_code == 200
-    data = response.get_json()
+    status, data = parse(response)
+    assert status == 200
     assert data['success'] == True
     assert 'entries' in data['data']
     assert 'pagination' in data['data']
 
-def test_get_my_entries(client, auth_headers):
+def test_get_my_entries(client, auth_headers, created_entry):
     """测试获取我的图鉴"""
-    # 先创建一个条目
-    test_create_entry(client, auth_headers)
-
     # 获取我的图鉴
-    response = client.get('/api/entries/my', headers=auth_headers)
+    response = client.get(URL_MY_ENTRIES, headers=auth_headers)
 
-    assert response.status_code == 200
-    data = response.get_json()
+    status, data = parse(response)
+    assert status == 200
     assert data['success'] == True
     assert len(data['data']['entries']) >= 1
 
-def test_search_entries(client, auth_headers):
+def test_search_entries(client, created_entry):
     """测试搜索图鉴"""
-    # 先创建一个条目
-    test_create_entry(client, auth_headers)
-
     # 搜索
-    response = client.get('/api/entries/search?q=猫')
+    response = client.get(URL_SEARCH)
 
-    assert response.status_code == 200
-    data = response.get_json()
+    status, data = parse(response)
+    assert status == 200
     assert data['success'] == True
 
-def test_get_user_stats(client, auth_headers):
+def test_get_user_stats(client, auth_headers, created_entry):
     """测试获取用户统计"""
-    # 先创建一个条目
-    test_create_entry(client, auth_headers)
-
     # 获取统计
-    response = client.get('/api/entries/my/stats', headers=auth_headers)
+    response = client.get(URL_MY_STATS, headers=auth_headers)
 
-    assert response.status_code == 200
-    data = response.get_json()
+    status, data = parse(response)
+    assert status == 200
     assert data['success'] == True
     assert 'stats' in data['data']
     assert data['data']['stats']['total_entries'] >= 1
@@ -123,29 +102,26 @@ def test_create_entry_missing_title(client, auth_headers):
         'content': '没有标题的条目'
     }
 
-    response = client.post('/api/entries',
+    response = client.post(URL_ENTRIES,
                            json=entry_data,
                            headers=auth_headers,
                            content_type='application/json')
 
-    assert response.status_code == 400
-    data = response.get_json()
+    status, data = parse(response)
+    assert status == 400
     assert data['success'] == False
 
-def test_delete_entry(client, auth_headers):
+def test_delete_entry(client, auth_headers, created_entry):
     """测试删除图鉴条目"""
-    # 先创建一个条目
-    entry_id = test_create_entry(client, auth_headers)
-
     # 删除条目
-    response = client.delete(f'/api/entries/{entry_id}', headers=auth_headers)
+    response = client.delete(URL_ENTRY(created_entry), headers=auth_headers)
 
-    assert response.status_code == 200
-    data = response.get_json()
+    status, data = parse(response)
+    assert status == 200
     assert data['success'] == True
 
     # 验证条目已被软删除
-    response = client.get(f'/api/entries/{entry_id}')
+    response = client.get(URL_ENTRY(created_entry))
     assert response.status_code == 404
 
 def test_unauthorized_access(client):
@@ -155,7 +131,7 @@ def test_unauthorized_access(client):
         'content': '这应该失败'
     }
 
-    response = client.post('/api/entries',
+    response = client.post(URL_ENTRIES,
                            json=entry_data,
                            content_type='application/json')
 
@@ -1,32 +1,51 @@
 import requests
 import pytest
+import socket
 import time
+from urllib.parse import urlsplit
+from requests.adapters import HTTPAdapter
 
 BASE_URL = "http://localhost:15000"
 
+# 先用TCP连接探测端口是否在监听，按指数退避重试（10ms起，总等待不到1秒）
+SERVER_PROBE_DELAYS = (0.01, 0.02, 0.04, 0.08, 0.16, 0.32)
+
+def server_port_open():
+    """检查服务器端口能否建立TCP连接"""
+    address = urlsplit(BASE_URL)
+    with socket.socket() as sock:
+        sock.settimeout(0.05)
+        return sock.connect_ex((address.hostname, address.port)) == 0
+
+@pytest.fixture(scope='session', autouse=True)
+def http_session():
+    """等待服务器启动（整个测试会话只探测一次），并提供复用连接的HTTP会话"""
+    session = requests.Session()
+    # 测试按顺序发请求，只保留一个持久连接
+    session.mount(BASE_URL, HTTPAdapter(pool_connections=1, pool_maxsize=1))
+    for delay in SERVER_PROBE_DELAYS:
+        if server_port_open():
+            break
+        time.sleep(delay)
+
+    # 端口可连接后再用一次HTTP请求确认服务正常
+    try:
+        healthy = session.get(f"{BASE_URL}/health", timeout=1).status_code == 200
+    except requests.RequestException:
+        healthy = False
+    if not healthy:
+        session.close()
+        pytest.skip("服务器未运行，跳过集成测试")
+
+    yield session
+
+    session.close()
+
+@pytest.mark.xdist_group(name="integration")
 class TestIntegration:
     """集成测试 - 需要运行的服务器"""
 
-    @pytest.fixture(autouse=True)
-    def setup(self):
-        """设置测试"""
-        # 等待服务器启动
-        self.wait_for_server()
-
-    def wait_for_server(self, max_attempts=5):
-        """等待服务器启动"""
-        for i in range(max_attempts):
-            try:
-                response = requests.get(f"{BASE_URL}/health", timeout=2)
-                if response.status_code == 200:
-                    return True
-            except:
-                if i < max_attempts - 1:
-                    time.sleep(1)
-                    continue
-        pytest.skip("服务器未运行，跳过集成测试")
-
-    def test_full_workflow(self):
+    def test_full_workflow(self, http_session, monkeypatch):
         """测试完整工作流程"""
         # 1. 注册用户
         register_data = {
@@ -36,7 +55,7 @@ class TestIntegration:
             "nickname": "集成测试用户"
         }
 
-        response = requests.post(f"{BASE_URL}/api/auth/register", json=register_data)
+        response = http_session.post(f"{BASE_URL}/api/auth/register", json=register_data)
         if response.status_code == 400 and "已存在" in response.json().get('message', ''):
             pass  # 用户已存在，继续测试
         else:
@@ -48,11 +67,12 @@ class TestIntegration:
             "password": "password123"
         }
 
-        response = requests.post(f"{BASE_URL}/api/auth/login", json=login_data)
+        response = http_session.post(f"{BASE_URL}/api/auth/login", json=login_data)
         assert response.status_code == 200
 
         token = response.json()['data']['tokens']['access_token']
-        headers = {"Authorization": f"Bearer {token}"}
+        # 认证头只设置一次，测试结束时自动从会话中移除
+        monkeypatch.setitem(http_session.headers, "Authorization", f"Bearer {token}")
 
         # 3. 创建图鉴条目
         entry_data = {
@@ -64,13 +84,13 @@ class TestIntegration:
             "tags": ["test", "integration"]
         }
 
-        response = requests.post(f"{BASE_URL}/api/entries", json=entry_data, headers=headers)
+        response = http_session.post(f"{BASE_URL}/api/entries", json=entry_data)
         assert response.status_code == 201
 
         entry_id = response.json()['data']['entry']['id']
 
         # 4. 获取图鉴条目
-        response = requests.get(f"{BASE_URL}/api/entries/{entry_id}")
+        response = http_session.get(f"{BASE_URL}/api/entries/{entry_id}")
         assert response.status_code == 200
         assert response.json()['data']['entry']['title'] == "集成测试图鉴"
 
@@ -80,16 +100,16 @@ class TestIntegration:
             "mood_score": 8
         }
 
-        response = requests.put(f"{BASE_URL}/api/entries/{entry_id}", json=update_data, headers=headers)
+        response = http_session.put(f"{BASE_URL}/api/entries/{entry_id}", json=update_data)
         assert response.status_code == 200
         assert response.json()['data']['entry']['mood_score'] == 8
 
         # 6. 搜索图鉴
-        response = requests.get(f"{BASE_URL}/api/entries/search?q=集成测试")
+        response = http_session.get(f"{BASE_URL}/api/entries/search?q=集成测试")
         assert response.status_code == 200
 
         # 7. 获取用户统计
-        response = requests.get(f"{BASE_URL}/api/entries/my/stats", headers=headers)
+        response = http_session.get(f"{BASE_URL}/api/entries/my/stats")
         assert response.status_code == 200
         assert response.json()['data']['stats']['total_entries'] >= 1
 
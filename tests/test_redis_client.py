@@ -0,0 +1,389 @@
+# test_redis_client.py
+import json
+import time
+
+import pytest
+from unittest.mock import call
+
+from app.utils.redis_client import RedisClient
+
+
+@pytest.fixture(autouse=True)
+def db_session():
+    """Redis客户端单元测试不访问数据库，覆盖conftest中的同名自动fixture"""
+    yield None
+
+
+@pytest.fixture
+def redis_mock(mocker):
+    """替代 redis.from_url 返回的客户端，各Lua脚本注册为独立的mock"""
+    mock = mocker.MagicMock(name='redis')
+    mock.register_script.side_effect = lambda script: mocker.MagicMock(name='script')
+    mock.get.return_value = None
+    mocker.patch('app.utils.redis_client.redis.from_url', return_value=mock)
+    return mock
+
+
+@pytest.fixture
+def redis_client(redis_mock):
+    client = RedisClient('redis://localhost:6379/15')
+    redis_mock.reset_mock()
+    return client
+
+
+@pytest.fixture
+def pipe(redis_mock):
+    return redis_mock.pipeline.return_value
+
+
+@pytest.fixture
+def disconnected_client(redis_client):
+    redis_client.client = None
+    return redis_client
+
+
+def test_mset_many_uses_one_pipeline(redis_client, redis_mock, pipe):
+    """测试批量设置在一个非事务管道中发出，过期时间传给每个SET"""
+    pipe.execute.return_value = [True, True]
+
+    assert redis_client.mset_many({'a': {'x': 1}, 'b': 'text'}, expire=60) is True
+
+    redis_mock.pipeline.assert_called_once_with(transaction=False)
+    assert pipe.set.call_args_list == [
+        call('a', '{"x": 1}', ex=60),
+        call('b', 'text', ex=60)
+    ]
+    pipe.execute.assert_called_once_with()
+    redis_mock.set.assert_not_called()
+
+
+def test_mset_many_without_expire_and_partial_failure(redis_client, pipe):
+    """测试未设置过期时间时传 ex=None，任一SET失败时返回False"""
+    pipe.execute.return_value = [True, None]
+
+    assert redis_client.mset_many({'a': 1, 'b': 2}) is False
+    assert pipe.set.call_args_list == [call('a', '1', ex=None), call('b', '2', ex=None)]
+
+
+def test_mget_many_deserializes_and_fills_default(redis_client, redis_mock, pipe):
+    """测试批量获取：JSON值反序列化，普通字符串原样返回，缺失键返回默认值"""
+    pipe.execute.return_value = ['{"x": 1}', None, 'plain']
+
+    result = redis_client.mget_many(['a', 'b', 'c'], default='missing')
+
+    assert result == {'a': {'x': 1}, 'b': 'missing', 'c': 'plain'}
+    redis_mock.pipeline.assert_called_once_with(transaction=False)
+    assert pipe.get.call_args_list == [call('a'), call('b'), call('c')]
+
+
+def test_mget_many_pipeline_error_returns_defaults(redis_client, pipe):
+    """测试管道执行失败时所有键返回默认值"""
+    pipe.execute.side_effect = ConnectionError('boom')
+
+    assert redis_client.mget_many(['a', 'b'], default=0) == {'a': 0, 'b': 0}
+
+
+def test_tag_search_batch_cache_keys(redis_client, pipe):
+    """测试批量缓存/读取标签搜索结果使用与单个方法相同的键"""
+    pipe.execute.return_value = [True, True]
+    assert redis_client.cache_tag_searches({'猫': ['t1'], '狗': []}, expire=600) is True
+    assert pipe.set.call_args_list == [
+        call('cache:{tag}:search:猫', '["t1"]', ex=600),
+        call('cache:{tag}:search:狗', '[]', ex=600)
+    ]
+
+    pipe.execute.return_value = ['["t1"]', None]
+    assert redis_client.get_cached_tag_searches(['猫', '狗']) == {'猫': ['t1'], '狗': None}
+    assert pipe.get.call_args_list == [
+        call('cache:{tag}:search:猫'),
+        call('cache:{tag}:search:狗')
+    ]
+
+
+def test_mset_mget_many_fall_back_when_disconnected(disconnected_client):
+    """测试Redis不可用时批量设置返回False，批量获取返回默认值"""
+    assert disconnected_client.mset_many({'a': 1}) is False
+    assert disconnected_client.mget_many(['a', 'b'], default=0) == {'a': 0, 'b': 0}
+
+
+def test_is_connected_skips_ping_within_health_ttl(redis_client, redis_mock):
+    """测试最近有成功命令时不发送PING"""
+    redis_client._last_ok = time.monotonic()
+
+    assert redis_client.is_connected() is True
+    redis_mock.ping.assert_not_called()
+
+
+def test_is_connected_pings_again_after_health_ttl(redis_client, redis_mock):
+    """测试超过 HEALTH_CACHE_TTL 后重新PING，成功时刷新时间戳，失败时返回False"""
+    stale = time.monotonic() - RedisClient.HEALTH_CACHE_TTL - 1
+    redis_client._last_ok = stale
+
+    assert redis_client.is_connected() is True
+    redis_mock.ping.assert_called_once_with()
+    assert redis_client._last_ok > stale
+
+    redis_client._last_ok = stale
+    redis_mock.ping.side_effect = ConnectionError('down')
+    assert redis_client.is_connected() is False
+
+
+@pytest.mark.parametrize('raw, expected', [
+    ('{"a": 1}', {'a': 1}),
+    ('[1, 2]', [1, 2]),
+    ('"quoted"', 'quoted'),
+    ('42', 42),
+    ('-1.5', -1.5),
+    ('true', True),
+    ('null', None),
+    ('plain text', 'plain text'),
+    ('标签', '标签'),
+    ('{not json', '{not json'),
+    ('', '')
+])
+def test_deserialize(raw, expected):
+    """测试JSON文本被解析，非JSON字符串原样返回"""
+    assert RedisClient._deserialize(raw) == expected
+
+
+def test_get_plain_string_skips_json_parser(redis_client, redis_mock, mocker):
+    """测试首字符不可能是JSON的值不经过json.loads"""
+    loads = mocker.patch('app.utils.redis_client.json', wraps=json).loads
+    redis_mock.get.return_value = 'plain text'
+
+    assert redis_client.get('k') == 'plain text'
+    loads.assert_not_called()
+
+    redis_mock.get.return_value = '{"a": 1}'
+    assert redis_client.get('k') == {'a': 1}
+    loads.assert_called_once_with('{"a": 1}')
+
+
+def test_from_shared_pool_reuses_pool_per_url(mocker):
+    """测试同一URL复用同一个连接池，不同URL各自创建连接池"""
+    mocker.patch.dict(RedisClient._shared_pools, clear=True)
+    pool_from_url = mocker.patch(
+        'app.utils.redis_client.redis.ConnectionPool.from_url',
+        side_effect=lambda url, **kwargs: mocker.MagicMock(name=url)
+    )
+    redis_cls = mocker.patch('app.utils.redis_client.redis.Redis')
+
+    RedisClient.from_shared_pool('redis://localhost:6379/0')
+    RedisClient.from_shared_pool('redis://localhost:6379/0')
+    RedisClient.from_shared_pool('redis://localhost:6379/1')
+
+    first, second, other = [c.kwargs['connection_pool'] for c in redis_cls.call_args_list]
+    assert first is second
+    assert other is not first
+    assert pool_from_url.call_args_list == [
+        call('redis://localhost:6379/0', max_connections=128, **RedisClient.CONNECTION_OPTIONS),
+        call('redis://localhost:6379/1', max_connections=128, **RedisClient.CONNECTION_OPTIONS)
+    ]
+
+
+def stable_sorted_hot_entries(counts, limit):
+    """原实现：按浏览次数对全部键做稳定降序排序后截取前limit个"""
+    ranked = sorted(counts.items(), key=lambda item: item[1], reverse=True)[:max(limit, 0)]
+    return [{'entry_id': entry_id, 'view_count': count} for entry_id, count in ranked]
+
+
+@pytest.fixture
+def view_counts(redis_mock, pipe):
+    """设置 views:* 键及其浏览次数，返回各条目按键顺序的次数"""
+    def setup(values):
+        keys = [f'views:{entry_id}' for entry_id in values]
+        redis_mock.scan_iter.return_value = iter(keys)
+        pipe.execute.return_value = list(values.values())
+        return {entry_id: int(value) if value else 0 for entry_id, value in values.items()}
+    return setup
+
+
+@pytest.mark.parametrize('limit', [1, 2, 3, 4, 5, 6])
+def test_get_hot_entries_ties_keep_key_order(redis_client, view_counts, limit):
+    """测试第K名有并列时，结果与原稳定全排序一致（并列按键顺序）"""
+    counts = view_counts({'a': '3', 'b': '5', 'c': '5', 'd': '1', 'e': '5', 'f': '3'})
+
+    assert redis_client.get_hot_entries(limit) == stable_sorted_hot_entries(counts, limit)
+
+
+def test_get_hot_entries_limit_larger_than_keys(redis_client, view_counts):
+    """测试limit大于键数量时返回全部条目"""
+    counts = view_counts({'a': '1', 'b': '7', 'c': '4'})
+
+    result = redis_client.get_hot_entries(10)
+
+    assert [entry['entry_id'] for entry in result] == ['b', 'c', 'a']
+    assert result == stable_sorted_hot_entries(counts, 10)
+
+
+@pytest.mark.parametrize('limit', [0, -1])
+def test_get_hot_entries_non_positive_limit(redis_client, view_counts, limit):
+    """测试limit不大于0时返回空列表"""
+    view_counts({'a': '1', 'b': '2'})
+
+    assert redis_client.get_hot_entries(limit) == []
+
+
+def test_get_hot_entries_missing_values_count_as_zero(redis_client, view_counts):
+    """测试键已过期（GET返回None）或值为空时按0次计算"""
+    counts = view_counts({'a': None, 'b': '2', 'c': '', 'd': '2'})
+
+    result = redis_client.get_hot_entries(4)
+
+    assert result == [
+        {'entry_id': 'b', 'view_count': 2},
+        {'entry_id': 'd', 'view_count': 2},
+        {'entry_id': 'a', 'view_count': 0},
+        {'entry_id': 'c', 'view_count': 0}
+    ]
+    assert result == stable_sorted_hot_entries(counts, 4)
+
+
+def test_get_hot_entries_scans_instead_of_keys(redis_client, redis_mock, pipe):
+    """测试用SCAN遍历浏览统计键并去重，不使用KEYS"""
+    redis_mock.scan_iter.return_value = iter(['views:a', 'views:b', 'views:a'])
+    pipe.execute.return_value = ['1', '2']
+
+    assert redis_client.get_hot_entries(10, batch_size=50) == [
+        {'entry_id': 'b', 'view_count': 2},
+        {'entry_id': 'a', 'view_count': 1}
+    ]
+    redis_mock.scan_iter.assert_called_once_with(match='views:*', count=50)
+    redis_mock.keys.assert_not_called()
+    assert pipe.get.call_args_list == [call('views:a'), call('views:b')]
+
+
+def test_get_hot_entries_without_keys(redis_client, redis_mock):
+    """测试没有浏览统计键时不发出管道请求"""
+    redis_mock.scan_iter.return_value = iter([])
+
+    assert redis_client.get_hot_entries() == []
+    redis_mock.pipeline.assert_not_called()
+
+
+def test_cache_delete_pattern_scans_and_unlinks_in_batches(redis_client, redis_mock, pipe):
+    """测试按模式删除用SCAN遍历，按batch_size分批UNLINK"""
+    keys = [f'cache:tag:{i}' for i in range(5)]
+    redis_mock.scan_iter.return_value = iter(keys)
+    pipe.execute.return_value = [2, 2, 1]
+
+    assert redis_client.cache_delete_pattern('tag:*', batch_size=2) == 5
+
+    redis_mock.scan_iter.assert_called_once_with(match='cache:tag:*', count=2)
+    redis_mock.keys.assert_not_called()
+    assert pipe.unlink.call_args_list == [
+        call(keys[0], keys[1]),
+        call(keys[2], keys[3]),
+        call(keys[4])
+    ]
+
+
+def test_cache_delete_pattern_falls_back_when_disconnected(disconnected_client):
+    """测试Redis不可用时按模式删除返回0"""
+    assert disconnected_client.cache_delete_pattern('tag:*') == 0
+
+
+def test_rate_limit_check_many_runs_script_on_pipeline(redis_client, pipe):
+    """测试批量速率限制：每个键的Lua脚本都在同一管道中执行"""
+    pipe.execute.return_value = [[1, 60], [6, 30]]
+
+    results = redis_client.rate_limit_check_many(['u1', 'u2'], limit=5, window=60)
+
+    assert redis_client._rate_script.call_args_list == [
+        call(keys=['rate_limit:u1'], args=[60], client=pipe),
+        call(keys=['rate_limit:u2'], args=[60], client=pipe)
+    ]
+    pipe.execute.assert_called_once_with()
+    assert [(r['allowed'], r['current'], r['remaining']) for r in results] == [
+        (True, 1, 4),
+        (False, 6, 0)
+    ]
+
+
+def test_rate_limit_check_many_falls_back_when_disconnected(disconnected_client):
+    """测试Redis不可用时每个键都返回放行的降级结果"""
+    fallback = {'allowed': True, 'current': 0, 'remaining': 5, 'reset_time': 0}
+
+    assert disconnected_client.rate_limit_check_many(['u1', 'u2'], limit=5, window=60) == [
+        fallback,
+        fallback
+    ]
+
+
+def test_cache_get_or_set_hit_skips_producer(redis_client, redis_mock, mocker):
+    """测试缓存命中时不调用producer"""
+    redis_mock.get.return_value = '{"a": 1}'
+    producer = mocker.Mock()
+
+    assert redis_client.cache_get_or_set('k', producer) == {'a': 1}
+
+    redis_mock.get.assert_called_once_with('cache:k')
+    producer.assert_not_called()
+    redis_mock.set.assert_not_called()
+
+
+def test_cache_get_or_set_miss_fills_with_nx(redis_client, redis_mock, mocker):
+    """测试缓存未命中时调用producer，并以 SET EX NX 回填"""
+    producer = mocker.Mock(return_value={'a': 1})
+
+    assert redis_client.cache_get_or_set('k', producer, expire=120) == {'a': 1}
+
+    producer.assert_called_once_with()
+    redis_mock.set.assert_called_once_with('cache:k', '{"a": 1}', ex=120, nx=True)
+
+
+def test_cache_get_or_set_locked_holder_releases_own_token(redis_client, redis_mock, mocker):
+    """测试拿到锁的请求计算回填，并用令牌比对脚本释放锁"""
+    redis_mock.set.return_value = True
+    producer = mocker.Mock(return_value='value')
+
+    assert redis_client.cache_get_or_set_locked('k', producer, expire=120, lock_timeout=5) == 'value'
+
+    producer.assert_called_once_with()
+    lock_call, fill_call = redis_mock.set.call_args_list
+    lock_key, token = lock_call.args
+    assert lock_key == 'lock:cache:k'
+    assert len(token) == 32 and token != '1'
+    assert lock_call.kwargs == {'ex': 5, 'nx': True}
+    assert fill_call == call('cache:k', 'value', ex=120, nx=True)
+    redis_client._release_lock_script.assert_called_once_with(keys=['lock:cache:k'], args=[token])
+    redis_mock.delete.assert_not_called()
+
+
+def test_cache_get_or_set_locked_waiter_reads_filled_cache(redis_client, redis_mock, mocker):
+    """测试未拿到锁的请求等待回填，不调用producer"""
+    mocker.patch('app.utils.redis_client.time.sleep')
+    redis_mock.get.side_effect = [None, None, 'value']
+    redis_mock.set.return_value = False
+    redis_mock.exists.return_value = True
+    producer = mocker.Mock()
+
+    assert redis_client.cache_get_or_set_locked('k', producer) == 'value'
+
+    producer.assert_not_called()
+    redis_client._release_lock_script.assert_not_called()
+
+
+def test_cache_get_or_set_locked_waiter_retries_lock_after_release(redis_client, redis_mock, mocker):
+    """测试锁消失而缓存未回填时，等待的请求重新竞争锁，而不是直接计算"""
+    mocker.patch('app.utils.redis_client.time.sleep')
+    redis_mock.set.side_effect = [False, True, True]
+    redis_mock.exists.return_value = False
+    producer = mocker.Mock(return_value='value')
+
+    assert redis_client.cache_get_or_set_locked('k', producer) == 'value'
+
+    producer.assert_called_once_with()
+    lock_calls = [c for c in redis_mock.set.call_args_list if c.args[0] == 'lock:cache:k']
+    assert len(lock_calls) == 2
+    assert lock_calls[0].args[1] == lock_calls[1].args[1]
+    redis_client._release_lock_script.assert_called_once()
+
+
+def test_cache_get_or_set_falls_back_when_disconnected(disconnected_client, mocker):
+    """测试Redis不可用时直接调用producer"""
+    producer = mocker.Mock(return_value='value')
+
+    assert disconnected_client.cache_get_or_set('k', producer) == 'value'
+    assert disconnected_client.cache_get_or_set_locked('k', producer) == 'value'
+    assert producer.call_count == 2